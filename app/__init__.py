@@ -1,11 +1,15 @@
 from flask import Flask
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from werkzeug.exceptions import HTTPException
 from app.config import config
-from app.extensions import db, jwt, mail, migrate, cors
+from app.extensions import db, jwt, mail, migrate, cors, cache
 from flask_cors import CORS
+from app.utils.serialization import OrjsonProvider
 
 def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = OrjsonProvider(app)
     CORS(app)
     
     # Initialize extensions
@@ -13,6 +17,7 @@ def create_app(config_name='default'):
     jwt.init_app(app)
     mail.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
     cors.init_app(app,
               resources={r"/api/*": {"origins": "http://localhost:3000"}},
               supports_credentials=True,
@@ -51,4 +56,24 @@ def create_app(config_name='default'):
     def internal_error(error):
         return {'message': 'Internal server error'}, 500
     
+    @app.errorhandler(IntegrityError)
+    def integrity_error(error):
+        db.session.rollback()
+        return {'message': 'Request conflicts with existing data or is missing required fields', 'success': False}, 400
+    
+    @app.errorhandler(SQLAlchemyError)
+    def database_error(error):
+        db.session.rollback()
+        app.logger.exception('Database error')
+        return {'message': 'Database error', 'success': False}, 500
+    
+    @app.errorhandler(Exception)
+    def unhandled_error(error):
+        # HTTP errors (404, 405, ...) keep their own responses
+        if isinstance(error, HTTPException):
+            return error
+        db.session.rollback()
+        app.logger.exception('Unhandled exception')
+        return {'message': 'Internal server error', 'success': False}, 500
+    
     return app
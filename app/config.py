@@ -8,8 +8,11 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///healthcare.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_RAISELOAD = False  # Raise on lazy loads in list endpoints
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # Werkzeug hash method; the work factor is stored in each hash, so changing it only affects new passwords
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:600000'
     
     # Mail configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
@@ -18,19 +21,37 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     
+    # Cache configuration. Cached entries are invalidated on write, which only
+    # reaches every worker through a shared Redis cache, so without REDIS_URL
+    # caching is disabled (the development server runs a single process)
+    CACHE_TYPE = 'RedisCache' if os.environ.get('REDIS_URL') else 'NullCache'
+    CACHE_REDIS_URL = os.environ.get('REDIS_URL')
+    CACHE_DEFAULT_TIMEOUT = 300
+    PROFILE_CACHE_TIMEOUT = 120
+    USER_CACHE_TIMEOUT = 300
+    
+    # Run background tasks (e.g. notifications) off the request thread
+    TASKS_ASYNC = True
+    
     # Stripe configuration
     STRIPE_PUBLISHABLE_KEY = os.environ.get('STRIPE_PUBLISHABLE_KEY')
     STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY')
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    SQLALCHEMY_RAISELOAD = True
+    CACHE_TYPE = 'RedisCache' if os.environ.get('REDIS_URL') else 'SimpleCache'
 
 class ProductionConfig(Config):
     DEBUG = False
 
 class TestingConfig(Config):
     TESTING = True
+    SQLALCHEMY_RAISELOAD = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
+    CACHE_TYPE = 'SimpleCache'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    TASKS_ASYNC = False
 
 config = {
     'development': DevelopmentConfig,
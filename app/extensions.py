@@ -3,9 +3,11 @@ from flask_jwt_extended import JWTManager
 from flask_mail import Mail
 from flask_migrate import Migrate
 from flask_cors import CORS
+from flask_caching import Cache
 
 db = SQLAlchemy()
 jwt = JWTManager()
 mail = Mail()
 migrate = Migrate()
-cors = CORS()
\ No newline at end of file
+cors = CORS()
+cache = Cache()
\ No newline at end of file
@@ -14,7 +14,7 @@ class Appointment(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     patient_id = db.Column(db.Integer, db.ForeignKey('patients.id'), nullable=False)
-    doctor_id = db.Column(db.Integer, db.ForeignKey('doctors.id'), nullable=False)
+    doctor_id = db.Column(db.Integer, db.ForeignKey('doctors.id'), nullable=False, index=True)
     appointment_date = db.Column(db.DateTime, nullable=False)
     duration = db.Column(db.Integer, default=30)  # in minutes
     status = db.Column(db.Enum(AppointmentStatus), default=AppointmentStatus.PENDING)
@@ -63,7 +63,7 @@ class TestReport(db.Model):
     __tablename__ = 'test_reports'
     
     id = db.Column(db.Integer, primary_key=True)
-    appointment_id = db.Column(db.Integer, db.ForeignKey('appointments.id'), nullable=False)
+    appointment_id = db.Column(db.Integer, db.ForeignKey('appointments.id'), nullable=False, index=True)
     patient_id = db.Column(db.Integer, db.ForeignKey('patients.id'), nullable=False)
     test_name = db.Column(db.String(200), nullable=False)
     test_type = db.Column(db.String(100), nullable=False)  # e.g., 'blood', 'urine', 'xray'
@@ -94,6 +94,21 @@ class TestReport(db.Model):
             'requested_date': self.requested_date.isoformat(),
             'completed_date': self.completed_date.isoformat() if self.completed_date else None
         }
+    
+    def to_summary_dict(self):
+        """Fields shown in report listings; skips the free-text columns"""
+        return {
+            'id': self.id,
+            'appointment_id': self.appointment_id,
+            'patient_id': self.patient_id,
+            'test_name': self.test_name,
+            'test_type': self.test_type,
+            'result': self.result,
+            'normal_range': self.normal_range,
+            'units': self.units,
+            'status': self.status,
+            'completed_date': self.completed_date.isoformat() if self.completed_date else None
+        }
 
 class VitalSigns(db.Model):
     __tablename__ = 'vital_signs'
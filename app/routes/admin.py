@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import User, UserRole, Patient, Doctor, Staff, Appointment, Notification
-from app.utils.auth import get_current_user, require_roles
+from app.utils.auth import get_current_user, require_roles, invalidate_user_cache
 from app.extensions import db
 from datetime import datetime, timedelta
 from sqlalchemy import func
@@ -117,6 +117,7 @@ def update_user(user_id):
                     setattr(user.staff, field, data[field])
         
         db.session.commit()
+        invalidate_user_cache(user_id)
         
         return jsonify({
             'message': 'User updated successfully',
@@ -139,6 +140,7 @@ def delete_user(user_id):
         # Soft delete by deactivating
         user.is_active = False
         db.session.commit()
+        invalidate_user_cache(user_id)
         
         return jsonify({'message': 'User deactivated successfully'}), 200
         
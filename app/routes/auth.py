@@ -1,8 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.models import User, UserRole, Patient, Doctor, Staff
-from app.utils.auth import hash_password, verify_password, create_jwt_token
-from app.extensions import db
+from app.utils.auth import (
+    hash_password, verify_password, create_jwt_token, get_current_user,
+    profile_cache_key, invalidate_user_cache
+)
+from app.utils.schemas import DecodeError, decode_request, RegisterRequest, LoginRequest
+from app.extensions import db, cache
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import exists, insert, update
 from datetime import datetime
 
 auth_bp = Blueprint("auth", __name__)
@@ -21,6 +26,11 @@ def parse_date(date_str):
         raise ValueError("Invalid date format. Use YYYY-MM-DD.")
 
 
+def pick(data, fields):
+    """Return the subset of data whose keys are in fields."""
+    return {field: data[field] for field in fields if field in data}
+
+
 def error(message, code=400):
     return jsonify({"message": message, "success": False}), code
 
@@ -32,98 +42,105 @@ def success(message, data=None, code=200):
     return jsonify(payload), code
 
 
+# -------------------------------------------------------
+# ROLE PROFILES
+# -------------------------------------------------------
+STAFF_ROLES = frozenset({
+    UserRole.STAFF, UserRole.NURSE, UserRole.LAB_TECHNICIAN,
+    UserRole.PHARMACIST, UserRole.WARD_MANAGER, UserRole.FINANCIAL_MANAGER
+})
+
+
+def make_patient(user, req):
+    return insert(Patient).values(
+        user_id=user.id,
+        blood_group=req.blood_group,
+        emergency_contact=req.emergency_contact,
+        insurance_info=req.insurance_info
+    )
+
+
+def make_doctor(user, req):
+    return insert(Doctor).values(
+        user_id=user.id,
+        license_number=req.license_number,
+        specialization=req.specialization,
+        years_of_experience=req.years_of_experience,
+        qualification=req.qualification,
+        consultation_fee=req.consultation_fee
+    )
+
+
+def make_staff(user, req):
+    return insert(Staff).values(
+        user_id=user.id,
+        staff_type=user.role.value,
+        department=req.department
+    )
+
+
+# Role -> factory building the INSERT for the profile row created alongside a new user
+ROLE_PROFILE_FACTORIES = {
+    UserRole.PATIENT: make_patient,
+    UserRole.DOCTOR: make_doctor,
+    **{role: make_staff for role in STAFF_ROLES}
+}
+
+
 # -------------------------------------------------------
 # REGISTER
 # -------------------------------------------------------
 @auth_bp.route("/register", methods=["POST"])
 def register():
+    # Decodes the body and checks required fields and types in one pass
     try:
-        data = request.get_json() or {}
-
-        # Required fields
-        required = ["email", "password", "first_name", "last_name", "role"]
-        missing = [f for f in required if f not in data]
-        if missing:
-            return error(f"Missing required fields: {', '.join(missing)}")
+        req = decode_request(RegisterRequest)
+    except DecodeError as de:
+        return error(f"Invalid request: {de}")
 
-        # Email already exists?
-        if User.query.filter_by(email=data["email"]).first():
-            return error("User already exists")
+    # Email already exists?
+    if db.session.query(exists().where(User.email == req.email)).scalar():
+        return error("User already exists")
 
-        # Parse date
-        dob = parse_date(data.get("date_of_birth"))
+    # Parse date
+    try:
+        dob = parse_date(req.date_of_birth)
+    except ValueError as ve:
+        return error(str(ve))
 
-        # Validate role
-        try:
-            role = UserRole(data["role"])
-        except ValueError:
-            return error("Invalid role.")
-
-        # Create User
-        user = User(
-            email=data["email"],
-            password_hash=hash_password(data["password"]),
-            first_name=data["first_name"],
-            last_name=data["last_name"],
-            phone=data.get("phone"),
-            address=data.get("address"),
-            date_of_birth=dob,
-            gender=data.get("gender"),
-            role=role
-        )
-
-        db.session.add(user)
-        db.session.flush()  # Get user.id
-
-        # ROLE-SPECIFIC PROFILES
-        if role == UserRole.PATIENT:
-            patient = Patient(
-                user_id=user.id,
-                blood_group=data.get("blood_group"),
-                emergency_contact=data.get("emergency_contact"),
-                insurance_info=data.get("insurance_info")
-            )
-            db.session.add(patient)
-
-        elif role == UserRole.DOCTOR:
-            doctor = Doctor(
-                user_id=user.id,
-                license_number=data.get("license_number"),
-                specialization=data.get("specialization"),
-                years_of_experience=data.get("years_of_experience"),
-                qualification=data.get("qualification"),
-                consultation_fee=data.get("consultation_fee", 0.0)
-            )
-            db.session.add(doctor)
-
-        elif role in [
-            UserRole.STAFF, UserRole.NURSE, UserRole.LAB_TECHNICIAN,
-            UserRole.PHARMACIST, UserRole.WARD_MANAGER, UserRole.FINANCIAL_MANAGER
-        ]:
-            staff = Staff(
-                user_id=user.id,
-                staff_type=role.value,
-                department=data.get("department")
-            )
-            db.session.add(staff)
+    # Validate role
+    try:
+        role = UserRole(req.role)
+    except ValueError:
+        return error("Invalid role.")
 
-        db.session.commit()
+    # Create User; RETURNING hands back the new row without a flush
+    user = db.session.scalar(insert(User).values(
+        email=req.email,
+        password_hash=hash_password(req.password),
+        first_name=req.first_name,
+        last_name=req.last_name,
+        phone=req.phone,
+        address=req.address,
+        date_of_birth=dob,
+        gender=req.gender,
+        role=role
+    ).returning(User))
 
-        token = create_jwt_token(user.id)
+    # ROLE-SPECIFIC PROFILES
+    make_profile = ROLE_PROFILE_FACTORIES.get(role)
+    if make_profile:
+        db.session.execute(make_profile(user, req))
 
-        return success(
-            "User registered successfully",
-            {"token": token, "user": user.to_dict()},
-            code=201
-        )
+    db.session.commit()
 
-    except ValueError as ve:
-        db.session.rollback()
-        return error(str(ve))
+    token = create_jwt_token(user.id)
 
-    except Exception as e:
-        db.session.rollback()
-        return error(f"Registration failed: {str(e)}", code=500)
+    return success(
+        "User registered successfully",
+        {"token": token, "user": user.to_dict()},
+        code=201
+    )
 
 
 # -------------------------------------------------------
@@ -132,25 +149,24 @@ def register():
 @auth_bp.route("/login", methods=["POST"])
 def login():
     try:
-        data = request.get_json() or {}
-
-        if not data.get("email") or not data.get("password"):
-            return error("Email and password required")
+        req = decode_request(LoginRequest)
+    except DecodeError:
+        return error("Email and password required")
 
-        user = User.query.filter_by(email=data["email"]).first()
+    if not req.email or not req.password:
+        return error("Email and password required")
 
-        if not user or not verify_password(user.password_hash, data["password"]):
-            return error("Invalid credentials", code=401)
+    user = User.query.filter_by(email=req.email).first()
 
-        if not user.is_active:
-            return error("Account is deactivated", code=403)
+    if not user or not verify_password(user.password_hash, req.password):
+        return error("Invalid credentials", code=401)
 
-        token = create_jwt_token(user.id)
+    if not user.is_active:
+        return error("Account is deactivated", code=403)
 
-        return success("Login successful", {"token": token, "user": user.to_dict()})
+    token = create_jwt_token(user.id)
 
-    except Exception as e:
-        return error(f"Login failed: {str(e)}", 500)
+    return success("Login successful", {"token": token, "user": user.to_dict()})
 
 
 # -------------------------------------------------------
@@ -159,29 +175,33 @@ def login():
 @auth_bp.route("/profile", methods=["GET"])
 @jwt_required()
 def get_profile():
-    try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+    user_id = get_jwt_identity()
+    cache_key = profile_cache_key(user_id)
 
-        if not user:
-            return error("User not found", 404)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return current_app.response_class(cached, mimetype="application/json"), 200
 
-        profile = user.to_dict()
+    user = User.query.get(user_id)
 
-        # ROLE DETAILS
-        if user.role == UserRole.PATIENT and user.patient:
-            profile["patient_info"] = user.patient.to_dict()
+    if not user:
+        return error("User not found", 404)
 
-        elif user.role == UserRole.DOCTOR and user.doctor:
-            profile["doctor_info"] = user.doctor.to_dict()
+    profile = user.to_dict()
 
-        elif user.staff:
-            profile["staff_info"] = user.staff.to_dict()
+    # ROLE DETAILS
+    if user.role == UserRole.PATIENT and user.patient:
+        profile["patient_info"] = user.patient.to_dict()
 
-        return success("Profile fetched successfully", profile)
+    elif user.role == UserRole.DOCTOR and user.doctor:
+        profile["doctor_info"] = user.doctor.to_dict()
 
-    except Exception as e:
-        return error(f"Failed to get profile: {str(e)}", 500)
+    elif user.staff:
+        profile["staff_info"] = user.staff.to_dict()
+
+    response, code = success("Profile fetched successfully", profile)
+    cache.set(cache_key, response.get_data(), timeout=current_app.config["PROFILE_CACHE_TIMEOUT"])
+    return response, code
 
 
 # -------------------------------------------------------
@@ -190,49 +210,47 @@ def get_profile():
 @auth_bp.route("/profile", methods=["PUT"])
 @jwt_required()
 def update_profile():
-    try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-
-        if not user:
-            return error("User not found", 404)
-
-        data = request.get_json() or {}
-
-        # BASIC FIELDS
-        basic_fields = ["first_name", "last_name", "phone", "address", "gender"]
-        for field in basic_fields:
-            if field in data:
-                setattr(user, field, data[field])
-
-        # DATE OF BIRTH
-        if "date_of_birth" in data:
-            try:
-                user.date_of_birth = parse_date(data["date_of_birth"])
-            except ValueError as ve:
-                return error(str(ve))
-
-        # PATIENT FIELDS
-        if user.role == UserRole.PATIENT and user.patient:
-            patient_fields = ["blood_group", "emergency_contact", "insurance_info"]
-            for field in patient_fields:
-                if field in data:
-                    setattr(user.patient, field, data[field])
-
-        # DOCTOR FIELDS
-        elif user.role == UserRole.DOCTOR and user.doctor:
-            doctor_fields = [
-                "specialization", "years_of_experience",
-                "qualification", "consultation_fee"
-            ]
-            for field in doctor_fields:
-                if field in data:
-                    setattr(user.doctor, field, data[field])
-
-        db.session.commit()
-
-        return success("Profile updated successfully", {"user": user.to_dict()})
-
-    except Exception as e:
-        db.session.rollback()
-        return error(f"Failed to update profile: {str(e)}", 500)
+    user_id = get_jwt_identity()
+    user = get_current_user()
+
+    if not user:
+        return error("User not found", 404)
+
+    data = request.get_json() or {}
+
+    # BASIC FIELDS
+    user_updates = pick(data, ["first_name", "last_name", "phone", "address", "gender"])
+
+    # DATE OF BIRTH
+    if "date_of_birth" in data:
+        try:
+            user_updates["date_of_birth"] = parse_date(data["date_of_birth"])
+        except ValueError as ve:
+            return error(str(ve))
+
+    if user_updates:
+        db.session.execute(update(User).where(User.id == user.id).values(**user_updates))
+
+    # PATIENT FIELDS
+    if user.role == UserRole.PATIENT and user.patient:
+        patient_updates = pick(data, ["blood_group", "emergency_contact", "insurance_info"])
+        if patient_updates:
+            db.session.execute(
+                update(Patient).where(Patient.id == user.patient.id).values(**patient_updates)
+            )
+
+    # DOCTOR FIELDS
+    elif user.role == UserRole.DOCTOR and user.doctor:
+        doctor_updates = pick(data, [
+            "specialization", "years_of_experience",
+            "qualification", "consultation_fee"
+        ])
+        if doctor_updates:
+            db.session.execute(
+                update(Doctor).where(Doctor.id == user.doctor.id).values(**doctor_updates)
+            )
+
+    db.session.commit()
+    invalidate_user_cache(user_id)
+
+    return success("Profile updated successfully", {"user": user.to_dict()})
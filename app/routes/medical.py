@@ -1,203 +1,186 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import User, UserRole, TestReport, VitalSigns, MedicalRecord, Patient, Appointment
 from app.utils.auth import get_current_user, require_roles
+from app.utils.notifications import create_notification, notify_test_report_available
+from app.utils.tasks import enqueue
+from app.utils.schemas import (
+    DecodeError, decode_request, TestReportRequest, VitalSignsRequest, MedicalRecordRequest,
+    PatientArrivalRequest, PassTokenRequest
+)
 from app.extensions import db
-from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload, load_only
+from datetime import datetime, timezone
 
 medical_bp = Blueprint('medical', __name__)
 
+# Columns read by to_summary_dict(), the only ones fetched by the list endpoints
+TEST_REPORT_SUMMARY_COLUMNS = (
+    TestReport.id, TestReport.appointment_id, TestReport.patient_id,
+    TestReport.test_name, TestReport.test_type, TestReport.result,
+    TestReport.normal_range, TestReport.units, TestReport.status,
+    TestReport.completed_date
+)
+
+def list_load_options(columns=None):
+    """Loader options for list endpoints; stray lazy loads raise when SQLALCHEMY_RAISELOAD is set"""
+    strict = bool(current_app.config.get('SQLALCHEMY_RAISELOAD'))
+    options = [load_only(*columns, raiseload=strict)] if columns else []
+    if strict:
+        options.append(raiseload('*'))
+    return options
+
 @medical_bp.route('/test-reports', methods=['POST'])
 @jwt_required()
 @require_roles(UserRole.LAB_TECHNICIAN, UserRole.DOCTOR)
 def upload_test_report():
+    user = get_current_user()
     try:
-        user = get_current_user()
-        data = request.get_json()
-        
-        required_fields = ['appointment_id', 'patient_id', 'test_name', 'test_type']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'message': f'Missing required field: {field}'}), 400
-        
-        test_report = TestReport(
-            appointment_id=data['appointment_id'],
-            patient_id=data['patient_id'],
-            test_name=data['test_name'],
-            test_type=data['test_type'],
-            result=data.get('result'),
-            normal_range=data.get('normal_range'),
-            units=data.get('units'),
-            comments=data.get('comments'),
-            performed_by=user.id,
-            status='completed',
-            completed_date=datetime.utcnow()
-        )
-        
-        db.session.add(test_report)
-        db.session.commit()
-        
-        # Notify patient and doctor
-        from app.utils.notifications import create_notification
-        
-        # Get appointment details for notification
-        from app.models import Appointment
-        appointment = Appointment.query.get(data['appointment_id'])
-        
-        if appointment:
-            create_notification(
-                title="Test Report Available",
-                message=f"Your {data['test_name']} test results are available",
-                receiver_id=appointment.patient.user.id,
-                sender_id=user.id,
-                notification_type="test_report"
-            )
-            
-            create_notification(
-                title="Test Report Available",
-                message=f"Test results for {appointment.patient.user.first_name} are available",
-                receiver_id=appointment.doctor.user.id,
-                sender_id=user.id,
-                notification_type="test_report"
-            )
-        
-        return jsonify({
-            'message': 'Test report uploaded successfully',
-            'test_report': test_report.to_dict()
-        }), 201
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'message': f'Failed to upload test report: {str(e)}'}), 500
+        req = decode_request(TestReportRequest)
+    except DecodeError as de:
+        return jsonify({'message': f'Invalid request: {de}'}), 400
+    
+    test_report = TestReport(
+        appointment_id=req.appointment_id,
+        patient_id=req.patient_id,
+        test_name=req.test_name,
+        test_type=req.test_type,
+        result=req.result,
+        normal_range=req.normal_range,
+        units=req.units,
+        comments=req.comments,
+        performed_by=user.id,
+        status='completed',
+        completed_date=datetime.utcnow()
+    )
+    
+    db.session.add(test_report)
+    db.session.commit()
+    
+    # Notify patient and doctor without holding up the response
+    enqueue(notify_test_report_available, req.appointment_id, req.test_name, sender_id=user.id)
+    
+    return jsonify({
+        'message': 'Test report uploaded successfully',
+        'test_report': test_report.to_dict()
+    }), 201
 
 @medical_bp.route('/test-reports', methods=['GET'])
 @jwt_required()
 def get_test_reports():
-    try:
-        user = get_current_user()
-        patient_id = request.args.get('patient_id')
-        
-        if user.role == UserRole.PATIENT:
-            query = TestReport.query.filter_by(patient_id=user.patient.id)
-        elif user.role == UserRole.DOCTOR:
-            if patient_id:
-                query = TestReport.query.filter_by(patient_id=patient_id)
-            else:
-                # Get reports for doctor's patients
-                from app.models import Appointment
-                doctor_appointments = [app.id for app in user.doctor.appointments]
-                query = TestReport.query.filter(TestReport.appointment_id.in_(doctor_appointments))
-        elif user.role == UserRole.LAB_TECHNICIAN:
-            query = TestReport.query.filter_by(performed_by=user.id)
+    user = get_current_user()
+    patient_id = request.args.get('patient_id')
+    
+    if user.role == UserRole.PATIENT:
+        query = TestReport.query.filter_by(patient_id=user.patient.id)
+    elif user.role == UserRole.DOCTOR:
+        if patient_id:
+            query = TestReport.query.filter_by(patient_id=patient_id)
         else:
-            query = TestReport.query
-        
-        test_reports = query.order_by(TestReport.completed_date.desc()).all()
-        
-        return jsonify({
-            'test_reports': [report.to_dict() for report in test_reports]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'message': f'Failed to fetch test reports: {str(e)}'}), 500
+            # Get reports for doctor's patients
+            doctor_appointments = select(Appointment.id).where(Appointment.doctor_id == user.doctor.id)
+            query = TestReport.query.filter(TestReport.appointment_id.in_(doctor_appointments))
+    elif user.role == UserRole.LAB_TECHNICIAN:
+        query = TestReport.query.filter_by(performed_by=user.id)
+    else:
+        query = TestReport.query
+    
+    # Execute the query before streaming starts so database errors reach the app's
+    # error handlers; rows are then fetched and serialized in batches of 500
+    statement = (query.options(*list_load_options(TEST_REPORT_SUMMARY_COLUMNS))
+                 .order_by(TestReport.completed_date.desc())
+                 .statement.execution_options(yield_per=500))
+    test_reports = db.session.scalars(statement)
+    
+    return current_app.json.list_response(
+        'test_reports', (report.to_summary_dict() for report in test_reports)
+    ), 200
 
 @medical_bp.route('/vital-signs', methods=['POST'])
 @jwt_required()
 @require_roles(UserRole.NURSE, UserRole.DOCTOR)
 def record_vital_signs():
+    user = get_current_user()
     try:
-        user = get_current_user()
-        data = request.get_json()
-        
-        required_fields = ['patient_id']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'message': f'Missing required field: {field}'}), 400
-        
-        vital_signs = VitalSigns(
-            patient_id=data['patient_id'],
-            recorded_by=user.id,
-            blood_pressure_systolic=data.get('blood_pressure_systolic'),
-            blood_pressure_diastolic=data.get('blood_pressure_diastolic'),
-            heart_rate=data.get('heart_rate'),
-            respiratory_rate=data.get('respiratory_rate'),
-            temperature=data.get('temperature'),
-            oxygen_saturation=data.get('oxygen_saturation'),
-            weight=data.get('weight'),
-            height=data.get('height'),
-            blood_sugar=data.get('blood_sugar'),
-            notes=data.get('notes')
-        )
-        
-        db.session.add(vital_signs)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Vital signs recorded successfully',
-            'vital_signs': vital_signs.to_dict()
-        }), 201
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'message': f'Failed to record vital signs: {str(e)}'}), 500
+        req = decode_request(VitalSignsRequest)
+    except DecodeError as de:
+        return jsonify({'message': f'Invalid request: {de}'}), 400
+    
+    vital_signs = VitalSigns(
+        patient_id=req.patient_id,
+        recorded_by=user.id,
+        blood_pressure_systolic=req.blood_pressure_systolic,
+        blood_pressure_diastolic=req.blood_pressure_diastolic,
+        heart_rate=req.heart_rate,
+        respiratory_rate=req.respiratory_rate,
+        temperature=req.temperature,
+        oxygen_saturation=req.oxygen_saturation,
+        weight=req.weight,
+        height=req.height,
+        blood_sugar=req.blood_sugar,
+        notes=req.notes
+    )
+    
+    db.session.add(vital_signs)
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Vital signs recorded successfully',
+        'vital_signs': vital_signs.to_dict()
+    }), 201
 
 @medical_bp.route('/vital-signs', methods=['GET'])
 @jwt_required()
 def get_vital_signs():
-    try:
-        user = get_current_user()
-        patient_id = request.args.get('patient_id')
-        
-        if user.role == UserRole.PATIENT:
-            query = VitalSigns.query.filter_by(patient_id=user.patient.id)
-        elif user.role in [UserRole.DOCTOR, UserRole.NURSE]:
-            if not patient_id:
-                return jsonify({'message': 'Patient ID is required'}), 400
-            query = VitalSigns.query.filter_by(patient_id=patient_id)
-        else:
-            return jsonify({'message': 'Unauthorized access'}), 403
-        
-        vital_signs = query.order_by(VitalSigns.recorded_at.desc()).all()
-        
-        return jsonify({
-            'vital_signs': [vs.to_dict() for vs in vital_signs]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'message': f'Failed to fetch vital signs: {str(e)}'}), 500
+    user = get_current_user()
+    patient_id = request.args.get('patient_id')
+    
+    if user.role == UserRole.PATIENT:
+        query = VitalSigns.query.filter_by(patient_id=user.patient.id)
+    elif user.role in [UserRole.DOCTOR, UserRole.NURSE]:
+        if not patient_id:
+            return jsonify({'message': 'Patient ID is required'}), 400
+        query = VitalSigns.query.filter_by(patient_id=patient_id)
+    else:
+        return jsonify({'message': 'Unauthorized access'}), 403
+    
+    vital_signs = query.options(*list_load_options()).order_by(VitalSigns.recorded_at.desc()).all()
+    
+    return jsonify({
+        'vital_signs': [vs.to_dict() for vs in vital_signs]
+    }), 200
 
 @medical_bp.route('/medical-records', methods=['POST'])
 @jwt_required()
 @require_roles(UserRole.DOCTOR, UserRole.NURSE)
 def add_medical_record():
+    user = get_current_user()
     try:
-        user = get_current_user()
-        data = request.get_json()
-        
-        required_fields = ['patient_id', 'record_type', 'description']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'message': f'Missing required field: {field}'}), 400
-        
-        medical_record = MedicalRecord(
-            patient_id=data['patient_id'],
-            record_type=data['record_type'],
-            description=data['description'],
-            date_recorded=datetime.fromisoformat(data.get('date_recorded', datetime.utcnow().isoformat())),
-            recorded_by=user.id
-        )
-        
-        db.session.add(medical_record)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Medical record added successfully',
-            'medical_record': medical_record.to_dict()
-        }), 201
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'message': f'Failed to add medical record: {str(e)}'}), 500
+        req = decode_request(MedicalRecordRequest)
+    except DecodeError as de:
+        return jsonify({'message': f'Invalid request: {de}'}), 400
+    
+    try:
+        date_recorded = datetime.fromisoformat(req.date_recorded) if req.date_recorded else datetime.now(timezone.utc).date()
+    except ValueError as e:
+        return jsonify({'message': f'Invalid date format: {str(e)}'}), 400
+    
+    medical_record = MedicalRecord(
+        patient_id=req.patient_id,
+        record_type=req.record_type,
+        description=req.description,
+        date_recorded=date_recorded,
+        recorded_by=user.id
+    )
+    
+    db.session.add(medical_record)
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Medical record added successfully',
+        'medical_record': medical_record.to_dict()
+    }), 201
 
 @medical_bp.route('/medical-records', methods=['GET'])
 @jwt_required()
@@ -207,91 +190,87 @@ def get_medical_records():
     Patients can view their own records.
     Doctors and nurses can view records of their patients.
     """
+    user = get_current_user()
+    patient_id = request.args.get('patient_id')
+    
+    # Build query based on user role
+    if user.role == UserRole.PATIENT:
+        # Patients can only view their own records
+        query = MedicalRecord.query.filter_by(patient_id=user.patient.id)
+        
+    elif user.role in [UserRole.DOCTOR, UserRole.NURSE]:
+        # Medical staff need patient_id parameter
+        if not patient_id:
+            return jsonify({'message': 'Patient ID is required for medical staff'}), 400
+        
+        # Optional: Verify patient belongs to doctor/nurse (for doctor's patients)
+        if user.role == UserRole.DOCTOR:
+            # Check if patient is assigned to this doctor
+            patient = Patient.query.get(patient_id)
+            if patient and patient.primary_doctor_id != user.doctor.id:
+                # Check through appointments
+                has_appointment = Appointment.query.filter_by(
+                    patient_id=patient_id,
+                    doctor_id=user.doctor.id
+                ).first()
+                if not has_appointment:
+                    return jsonify({'message': 'Not authorized to view this patient\'s records'}), 403
+        
+        query = MedicalRecord.query.filter_by(patient_id=patient_id)
+        
+    elif user.role in [UserRole.LAB_TECHNICIAN, UserRole.STAFF]:
+        # Other staff roles might need limited access
+        if not patient_id:
+            return jsonify({'message': 'Patient ID is required'}), 400
+        query = MedicalRecord.query.filter_by(patient_id=patient_id)
+        
+    else:
+        return jsonify({'message': 'Unauthorized access'}), 403
+    
+    # Optional filtering parameters
+    record_type = request.args.get('record_type')
+    if record_type:
+        query = query.filter_by(record_type=record_type)
+    
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
     try:
-        user = get_current_user()
-        patient_id = request.args.get('patient_id')
-        
-        # Build query based on user role
-        if user.role == UserRole.PATIENT:
-            # Patients can only view their own records
-            query = MedicalRecord.query.filter_by(patient_id=user.patient.id)
-            
-        elif user.role in [UserRole.DOCTOR, UserRole.NURSE]:
-            # Medical staff need patient_id parameter
-            if not patient_id:
-                return jsonify({'message': 'Patient ID is required for medical staff'}), 400
-            
-            # Optional: Verify patient belongs to doctor/nurse (for doctor's patients)
-            if user.role == UserRole.DOCTOR:
-                # Check if patient is assigned to this doctor
-                patient = Patient.query.get(patient_id)
-                if patient and patient.primary_doctor_id != user.doctor.id:
-                    # Check through appointments
-                    from app.models import Appointment
-                    has_appointment = Appointment.query.filter_by(
-                        patient_id=patient_id,
-                        doctor_id=user.doctor.id
-                    ).first()
-                    if not has_appointment:
-                        return jsonify({'message': 'Not authorized to view this patient\'s records'}), 403
-            
-            query = MedicalRecord.query.filter_by(patient_id=patient_id)
-            
-        elif user.role in [UserRole.LAB_TECHNICIAN, UserRole.STAFF]:
-            # Other staff roles might need limited access
-            if not patient_id:
-                return jsonify({'message': 'Patient ID is required'}), 400
-            query = MedicalRecord.query.filter_by(patient_id=patient_id)
-            
-        else:
-            return jsonify({'message': 'Unauthorized access'}), 403
-        
-        # Optional filtering parameters
-        record_type = request.args.get('record_type')
-        if record_type:
-            query = query.filter_by(record_type=record_type)
-        
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
         if start_date:
             query = query.filter(MedicalRecord.date_recorded >= datetime.fromisoformat(start_date))
         if end_date:
             query = query.filter(MedicalRecord.date_recorded <= datetime.fromisoformat(end_date))
-        
-        # Pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        paginated_records = query.order_by(MedicalRecord.date_recorded.desc()).paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
-        
-        records_data = [record.to_dict() for record in paginated_records.items]
-        
-        # Include doctor/nurse names if not in to_dict()
-        for record in records_data:
-            recorded_by_user = User.query.get(record['recorded_by'])
-            if recorded_by_user:
-                record['recorded_by_name'] = f"{recorded_by_user.first_name} {recorded_by_user.last_name}"
-        
-        return jsonify({
-            'message': 'Medical records retrieved successfully',
-            'medical_records': records_data,
-            'pagination': {
-                'total': paginated_records.total,
-                'pages': paginated_records.pages,
-                'current_page': paginated_records.page,
-                'per_page': paginated_records.per_page,
-                'has_next': paginated_records.has_next,
-                'has_prev': paginated_records.has_prev
-            }
-        }), 200
-        
     except ValueError as e:
         return jsonify({'message': f'Invalid date format: {str(e)}'}), 400
-    except Exception as e:
-        return jsonify({'message': f'Failed to fetch medical records: {str(e)}'}), 500
+    
+    # Pagination
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    paginated_records = query.order_by(MedicalRecord.date_recorded.desc()).paginate(
+        page=page, 
+        per_page=per_page, 
+        error_out=False
+    )
+    
+    records_data = [record.to_dict() for record in paginated_records.items]
+    
+    # Include doctor/nurse names if not in to_dict()
+    for record in records_data:
+        recorded_by_user = User.query.get(record['recorded_by'])
+        if recorded_by_user:
+            record['recorded_by_name'] = f"{recorded_by_user.first_name} {recorded_by_user.last_name}"
+    
+    return jsonify({
+        'message': 'Medical records retrieved successfully',
+        'medical_records': records_data,
+        'pagination': {
+            'total': paginated_records.total,
+            'pages': paginated_records.pages,
+            'current_page': paginated_records.page,
+            'per_page': paginated_records.per_page,
+            'has_next': paginated_records.has_next,
+            'has_prev': paginated_records.has_prev
+        }
+    }), 200
 
 
 @medical_bp.route('/medical-records/<int:record_id>', methods=['GET'])
@@ -300,133 +279,122 @@ def get_medical_record_by_id(record_id):
     """
     Get a specific medical record by ID.
     """
-    try:
-        user = get_current_user()
-        
-        # Get the medical record
-        medical_record = MedicalRecord.query.get(record_id)
-        if not medical_record:
-            return jsonify({'message': 'Medical record not found'}), 404
-        
-        # Check authorization
-        if user.role == UserRole.PATIENT:
-            if medical_record.patient_id != user.patient.id:
-                return jsonify({'message': 'Not authorized to view this record'}), 403
-                
-        elif user.role in [UserRole.DOCTOR, UserRole.NURSE]:
-            # For doctors, check if they are the patient's doctor or have appointments with them
-            if user.role == UserRole.DOCTOR:
-                patient = Patient.query.get(medical_record.patient_id)
-                if patient and patient.primary_doctor_id != user.doctor.id:
-                    # Check through appointments
-                    from app.models import Appointment
-                    has_appointment = Appointment.query.filter_by(
-                        patient_id=medical_record.patient_id,
-                        doctor_id=user.doctor.id
-                    ).first()
-                    if not has_appointment:
-                        return jsonify({'message': 'Not authorized to view this record'}), 403
-        
-        elif user.role in [UserRole.LAB_TECHNICIAN, UserRole.STAFF]:
-            # Limited access for other staff - might need specific permissions
-            return jsonify({'message': 'Not authorized to view medical records'}), 403
-        else:
-            return jsonify({'message': 'Unauthorized access'}), 403
-        
-        # Get record data
-        record_data = medical_record.to_dict()
-        
-        # Add recorded by user name
-        recorded_by_user = User.query.get(record_data['recorded_by'])
-        if recorded_by_user:
-            record_data['recorded_by_name'] = f"{recorded_by_user.first_name} {recorded_by_user.last_name}"
-        
-        # Add patient name for staff reference
-        if user.role in [UserRole.DOCTOR, UserRole.NURSE]:
+    user = get_current_user()
+    
+    # Get the medical record
+    medical_record = MedicalRecord.query.get(record_id)
+    if not medical_record:
+        return jsonify({'message': 'Medical record not found'}), 404
+    
+    # Check authorization
+    if user.role == UserRole.PATIENT:
+        if medical_record.patient_id != user.patient.id:
+            return jsonify({'message': 'Not authorized to view this record'}), 403
+            
+    elif user.role in [UserRole.DOCTOR, UserRole.NURSE]:
+        # For doctors, check if they are the patient's doctor or have appointments with them
+        if user.role == UserRole.DOCTOR:
             patient = Patient.query.get(medical_record.patient_id)
-            if patient and patient.user:
-                record_data['patient_name'] = f"{patient.user.first_name} {patient.user.last_name}"
-        
-        return jsonify({
-            'message': 'Medical record retrieved successfully',
-            'medical_record': record_data
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'message': f'Failed to fetch medical record: {str(e)}'}), 500
+            if patient and patient.primary_doctor_id != user.doctor.id:
+                # Check through appointments
+                has_appointment = Appointment.query.filter_by(
+                    patient_id=medical_record.patient_id,
+                    doctor_id=user.doctor.id
+                ).first()
+                if not has_appointment:
+                    return jsonify({'message': 'Not authorized to view this record'}), 403
+    
+    elif user.role in [UserRole.LAB_TECHNICIAN, UserRole.STAFF]:
+        # Limited access for other staff - might need specific permissions
+        return jsonify({'message': 'Not authorized to view medical records'}), 403
+    else:
+        return jsonify({'message': 'Unauthorized access'}), 403
+    
+    # Get record data
+    record_data = medical_record.to_dict()
+    
+    # Add recorded by user name
+    recorded_by_user = User.query.get(record_data['recorded_by'])
+    if recorded_by_user:
+        record_data['recorded_by_name'] = f"{recorded_by_user.first_name} {recorded_by_user.last_name}"
+    
+    # Add patient name for staff reference
+    if user.role in [UserRole.DOCTOR, UserRole.NURSE]:
+        patient = Patient.query.get(medical_record.patient_id)
+        if patient and patient.user:
+            record_data['patient_name'] = f"{patient.user.first_name} {patient.user.last_name}"
+    
+    return jsonify({
+        'message': 'Medical record retrieved successfully',
+        'medical_record': record_data
+    }), 200
 
 @medical_bp.route('/patient-arrival/<int:appointment_id>', methods=['PUT'])
 @jwt_required()
 @require_roles(UserRole.NURSE, UserRole.STAFF)
 def update_patient_arrival(appointment_id):
+    user = get_current_user()
+    
+    appointment = Appointment.query.get(appointment_id)
+    if not appointment:
+        return jsonify({'message': 'Appointment not found'}), 404
+    
     try:
-        user = get_current_user()
-        data = request.get_json()
-        
-        appointment = Appointment.query.get(appointment_id)
-        if not appointment:
-            return jsonify({'message': 'Appointment not found'}), 404
-        
-        if 'arrival_status' not in data:
-            return jsonify({'message': 'Arrival status is required'}), 400
-        
-        # Update appointment with arrival status
-        appointment.arrival_status = data['arrival_status']  # You'll need to add this field to Appointment model
-        appointment.arrival_time = datetime.utcnow() if data['arrival_status'] == 'arrived' else None
-        appointment.checked_in_by = user.id
-        
-        db.session.commit()
-        
-        # Notify doctor
-        from app.utils.notifications import create_notification
-        create_notification(
-            title="Patient Arrival Update",
-            message=f"Patient {appointment.patient.user.first_name} has {data['arrival_status']}",
-            receiver_id=appointment.doctor.user.id,
-            sender_id=user.id,
-            notification_type="patient_arrival"
-        )
-        
-        return jsonify({
-            'message': 'Patient arrival status updated successfully',
-            'appointment': appointment.to_dict()
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'message': f'Failed to update patient arrival: {str(e)}'}), 500
+        req = decode_request(PatientArrivalRequest)
+    except DecodeError as de:
+        return jsonify({'message': f'Invalid request: {de}'}), 400
+    
+    # Update appointment with arrival status
+    appointment.arrival_status = req.arrival_status  # You'll need to add this field to Appointment model
+    appointment.arrival_time = datetime.utcnow() if req.arrival_status == 'arrived' else None
+    appointment.checked_in_by = user.id
+    
+    # Notify doctor; saved by the same commit as the arrival update
+    create_notification(
+        title="Patient Arrival Update",
+        message=f"Patient {appointment.patient.user.first_name} has {req.arrival_status}",
+        receiver_id=appointment.doctor.user.id,
+        sender_id=user.id,
+        notification_type="patient_arrival",
+        commit=False
+    )
+    
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Patient arrival status updated successfully',
+        'appointment': appointment.to_dict()
+    }), 200
 
 @medical_bp.route('/pass-tokens', methods=['POST'])
 @jwt_required()
 @require_roles(UserRole.STAFF)
 def generate_pass_token():
+    user = get_current_user()
     try:
-        user = get_current_user()
-        data = request.get_json()
-        
-        required_fields = ['patient_id', 'purpose', 'valid_until']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'message': f'Missing required field: {field}'}), 400
-        
-        # You'll need to create a PassToken model
-        pass_token = PassToken(
-            patient_id=data['patient_id'],
-            generated_by=user.id,
-            purpose=data['purpose'],
-            token=f"PASS-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-            valid_until=datetime.fromisoformat(data['valid_until']),
-            status='active'
-        )
-        
-        db.session.add(pass_token)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Pass token generated successfully',
-            'pass_token': pass_token.to_dict()
-        }), 201
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'message': f'Failed to generate pass token: {str(e)}'}), 500
+        req = decode_request(PassTokenRequest)
+    except DecodeError as de:
+        return jsonify({'message': f'Invalid request: {de}'}), 400
+    
+    try:
+        valid_until = datetime.fromisoformat(req.valid_until)
+    except ValueError as e:
+        return jsonify({'message': f'Invalid date format: {str(e)}'}), 400
+    
+    # You'll need to create a PassToken model
+    pass_token = PassToken(
+        patient_id=req.patient_id,
+        generated_by=user.id,
+        purpose=req.purpose,
+        token=f"PASS-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        valid_until=valid_until,
+        status='active'
+    )
+    
+    db.session.add(pass_token)
+    db.session.commit()
+    
+    return jsonify({
+        'message': 'Pass token generated successfully',
+        'pass_token': pass_token.to_dict()
+    }), 201
@@ -1,11 +1,14 @@
 from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app
 from flask_jwt_extended import create_access_token, get_jwt_identity
-from app.models import User, UserRole
-from app.extensions import db
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models import User, UserRole, Patient, Doctor, Staff
+from app.extensions import db, cache
 from functools import wraps
 
 def hash_password(password):
-    return generate_password_hash(password)
+    return generate_password_hash(password, method=current_app.config['PASSWORD_HASH_METHOD'])
 
 def verify_password(password_hash, password):
     return check_password_hash(password_hash, password)
@@ -13,8 +16,51 @@ def verify_password(password_hash, password):
 def create_jwt_token(user_id):
     return create_access_token(identity=user_id)
 
+def profile_cache_key(user_id):
+    return f"profile:{user_id}"
+
+def user_cache_key(user_id):
+    return f"user:{user_id}"
+
+def invalidate_user_cache(user_id):
+    cache.delete_many(profile_cache_key(user_id), user_cache_key(user_id))
+
+# Role profiles kept in the cached user record, as (relationship, model)
+CACHED_PROFILES = (('patient', Patient), ('doctor', Doctor), ('staff', Staff))
+
+def _detached(model, **values):
+    """Attach a partially populated instance to the session without a SELECT"""
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    return db.session.merge(instance, load=False)
+
+def _user_from_record(record):
+    """Rebuild the current user from its cached record; other columns load on first access"""
+    user = _detached(User, id=record['id'], role=UserRole(record['role']), is_active=record['is_active'])
+    for name, model in CACHED_PROFILES:
+        if name in user.__dict__:
+            continue
+        profile_id = record[f'{name}_id']
+        profile = _detached(model, id=profile_id, user_id=user.id) if profile_id else None
+        set_committed_value(user, name, profile)
+    return user
+
 def get_current_user():
-    return User.query.get(get_jwt_identity())
+    user_id = get_jwt_identity()
+    record = cache.get(user_cache_key(user_id))
+    if record is not None:
+        return _user_from_record(record)
+    
+    user = db.session.get(User, user_id, options=[
+        joinedload(User.patient), joinedload(User.doctor), joinedload(User.staff)
+    ])
+    if user:
+        record = {'id': user.id, 'role': user.role.value, 'is_active': user.is_active}
+        for name, _ in CACHED_PROFILES:
+            profile = getattr(user, name)
+            record[f'{name}_id'] = profile.id if profile else None
+        cache.set(user_cache_key(user_id), record, timeout=current_app.config['USER_CACHE_TIMEOUT'])
+    return user
 
 def require_roles(*roles):
     def wrapper(fn):
@@ -1,8 +1,11 @@
-from app.models import Notification, User, UserRole
+from app.models import Notification, User, UserRole, Appointment, Patient, Doctor
 from app.extensions import db, mail
 from flask_mail import Message
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
 
-def create_notification(title, message, receiver_id, sender_id=None, notification_type=None):
+def create_notification(title, message, receiver_id, sender_id=None, notification_type=None, commit=True):
+    """Add a notification; pass commit=False to save it with the caller's own commit"""
     notification = Notification(
         title=title,
         message=message,
@@ -11,9 +14,17 @@ def create_notification(title, message, receiver_id, sender_id=None, notificatio
         notification_type=notification_type
     )
     db.session.add(notification)
-    db.session.commit()
+    if commit:
+        db.session.commit()
     return notification
 
+def create_notifications(notifications, commit=True):
+    """Insert several notifications (dicts of create_notification arguments) in one statement"""
+    if notifications:
+        db.session.execute(insert(Notification), list(notifications))
+        if commit:
+            db.session.commit()
+
 def send_email_notification(recipient, subject, body):
     try:
         msg = Message(
@@ -32,18 +43,46 @@ def notify_appointment_status(appointment, old_status=None):
     doctor_user = appointment.doctor.user
     
     # Notify patient
-    create_notification(
+    notifications = [dict(
         title="Appointment Status Update",
         message=f"Your appointment with Dr. {doctor_user.last_name} has been {appointment.status.value}",
         receiver_id=patient_user.id,
         notification_type="appointment"
-    )
+    )]
     
     # Notify doctor if status changed by admin/patient
     if old_status and old_status != appointment.status:
-        create_notification(
+        notifications.append(dict(
             title="Appointment Status Update",
             message=f"Appointment with {patient_user.first_name} {patient_user.last_name} has been {appointment.status.value}",
             receiver_id=doctor_user.id,
             notification_type="appointment"
-        )
\ No newline at end of file
+        ))
+    
+    create_notifications(notifications)
+
+def notify_test_report_available(appointment_id, test_name, sender_id=None):
+    """Notify the patient and doctor of an appointment that a test report is available"""
+    appointment = db.session.get(Appointment, appointment_id, options=[
+        joinedload(Appointment.patient).joinedload(Patient.user),
+        joinedload(Appointment.doctor).joinedload(Doctor.user)
+    ])
+    if not appointment:
+        return
+    
+    create_notifications([
+        dict(
+            title="Test Report Available",
+            message=f"Your {test_name} test results are available",
+            receiver_id=appointment.patient.user.id,
+            sender_id=sender_id,
+            notification_type="test_report"
+        ),
+        dict(
+            title="Test Report Available",
+            message=f"Test results for {appointment.patient.user.first_name} are available",
+            receiver_id=appointment.doctor.user.id,
+            sender_id=sender_id,
+            notification_type="test_report"
+        )
+    ])
\ No newline at end of file
@@ -0,0 +1,112 @@
+import msgspec
+from functools import cache
+from flask import request
+
+# Request bodies are decoded and validated by msgspec in a single pass over the
+# raw bytes. Decoding is non-strict so numeric strings such as "5" are still
+# accepted for integer/float fields, as they were before. The handlers stored
+# whatever JSON type the client sent, so ``Int`` fields also take whole-number
+# floats (72.0) and ``Text`` fields also take numbers (a phone number sent as
+# 5551234); both are normalized to int/str after decoding.
+
+DecodeError = msgspec.DecodeError
+
+Int = int | float
+Text = str | int | float
+
+def decode_request(schema):
+    """Decode the JSON request body into a ``schema`` instance; raises DecodeError if invalid"""
+    return msgspec.json.decode(request.get_data(), type=schema, strict=False)
+
+@cache
+def _lenient_fields(schema):
+    """Return the (name, target type) pairs of ``schema``'s Int and Text fields"""
+    lenient = []
+    for field in msgspec.structs.fields(schema):
+        types = set(getattr(field.type, '__args__', ()))
+        if {str, int, float} <= types:
+            lenient.append((field.name, str))
+        elif {int, float} <= types:
+            lenient.append((field.name, int))
+    return tuple(lenient)
+
+class RequestBody(msgspec.Struct):
+    def __post_init__(self):
+        for name, target in _lenient_fields(type(self)):
+            value = getattr(self, name)
+            if target is int and isinstance(value, float):
+                if not value.is_integer():
+                    raise ValueError(f"Expected `int`, got `float` - at `$.{name}`")
+                setattr(self, name, int(value))
+            elif target is str and isinstance(value, (int, float)):
+                setattr(self, name, str(value))
+
+# -------------------------------------------------------
+# Auth
+# -------------------------------------------------------
+class RegisterRequest(RequestBody):
+    email: str
+    password: str
+    first_name: str
+    last_name: str
+    role: str
+    phone: Text | None = None
+    address: Text | None = None
+    date_of_birth: str | None = None
+    gender: Text | None = None
+    # Patient profile
+    blood_group: Text | None = None
+    emergency_contact: Text | None = None
+    insurance_info: Text | None = None
+    # Doctor profile
+    license_number: Text | None = None
+    specialization: Text | None = None
+    years_of_experience: Int | None = None
+    qualification: Text | None = None
+    consultation_fee: float | None = 0.0
+    # Staff profile
+    department: Text | None = None
+
+class LoginRequest(RequestBody):
+    email: str
+    password: str
+
+# -------------------------------------------------------
+# Medical
+# -------------------------------------------------------
+class TestReportRequest(RequestBody):
+    appointment_id: Int
+    patient_id: Int
+    test_name: str
+    test_type: str
+    result: Text | None = None
+    normal_range: Text | None = None
+    units: Text | None = None
+    comments: Text | None = None
+
+class VitalSignsRequest(RequestBody):
+    patient_id: Int
+    blood_pressure_systolic: Int | None = None
+    blood_pressure_diastolic: Int | None = None
+    heart_rate: Int | None = None
+    respiratory_rate: Int | None = None
+    temperature: float | None = None
+    oxygen_saturation: float | None = None
+    weight: float | None = None
+    height: float | None = None
+    blood_sugar: float | None = None
+    notes: Text | None = None
+
+class MedicalRecordRequest(RequestBody):
+    patient_id: Int
+    record_type: str
+    description: str
+    date_recorded: str | None = None
+
+class PatientArrivalRequest(RequestBody):
+    arrival_status: str
+
+class PassTokenRequest(RequestBody):
+    patient_id: Int
+    purpose: str
+    valid_until: str
@@ -0,0 +1,54 @@
+import orjson
+from flask import stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson instead of the stdlib json module."""
+
+    option = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def _options(self, indent=False):
+        option = self.option
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string."""
+        return orjson.dumps(
+            obj,
+            default=kwargs.get("default", self.default),
+            option=self._options(indent=bool(kwargs.get("indent")))
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or UTF-8 bytes, such as a request body."""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as JSON and wrap them in a response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent=indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def list_response(self, key, items):
+        """Stream ``{key: [...]}`` as a response, encoding one item at a time.
+
+        ``items`` may be a lazy iterable (e.g. a ``yield_per`` query), so only
+        the current batch of rows is held in memory.
+        """
+        option = self._options()
+
+        def generate():
+            yield b"{" + orjson.dumps(key) + b":["
+            for index, item in enumerate(items):
+                if index:
+                    yield b","
+                yield orjson.dumps(item, default=self.default, option=option)
+            yield b"]}\n"
+
+        return self._app.response_class(stream_with_context(generate()), mimetype=self.mimetype)
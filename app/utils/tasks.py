@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+# Shared pool for work that does not need to finish before the response is sent
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='background-task')
+
+def enqueue(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) in a background thread inside an app context.
+    Runs inline when TASKS_ASYNC is disabled (e.g. in tests)."""
+    app = current_app._get_current_object()
+    if not app.config.get('TASKS_ASYNC', True):
+        return fn(*args, **kwargs)
+
+    def run():
+        with app.app_context():
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                app.logger.exception(f"Background task {fn.__name__} failed")
+
+    return executor.submit(run)
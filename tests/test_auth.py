@@ -1,4 +1,5 @@
 import pytest
+import os
 import json
 from app import create_app
 from app.extensions import db
@@ -47,4 +48,92 @@ def test_login(client):
     assert response.status_code == 200
     data = json.loads(response.data)
     assert data['message'] == 'Login successful'
-    assert 'token' in data
\ No newline at end of file
+    assert 'token' in data
+
+def test_profile_reflects_update(client):
+    response = client.post('/api/auth/register', json={
+        'email': 'profile@test.com',
+        'password': 'password123',
+        'first_name': 'Old',
+        'last_name': 'Name',
+        'role': 'patient'
+    })
+    headers = {'Authorization': f"Bearer {json.loads(response.data)['token']}"}
+
+    # Populate the profile cache, then make sure the update invalidates it
+    assert json.loads(client.get('/api/auth/profile', headers=headers).data)['first_name'] == 'Old'
+    client.put('/api/auth/profile', headers=headers, json={'first_name': 'New', 'blood_group': 'O+'})
+
+    response = client.get('/api/auth/profile', headers=headers)
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['first_name'] == 'New'
+    assert data['patient_info']['user']['first_name'] == 'New'
+    assert data['patient_info']['blood_group'] == 'O+'
+
+def test_register_duplicate_email(client):
+    user = {
+        'email': 'dup@test.com',
+        'password': 'password123',
+        'first_name': 'Dup',
+        'last_name': 'User',
+        'role': 'patient'
+    }
+    assert client.post('/api/auth/register', json=user).status_code == 201
+
+    response = client.post('/api/auth/register', json=user)
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'User already exists'
+
+def test_register_missing_field(client):
+    response = client.post('/api/auth/register', json={
+        'email': 'missing@test.com',
+        'password': 'password123',
+        'first_name': 'Missing',
+        'last_name': 'Role'
+    })
+
+    assert response.status_code == 400
+    assert '`role`' in json.loads(response.data)['message']
+
+def test_register_doctor_without_license(client):
+    response = client.post('/api/auth/register', json={
+        'email': 'nolicense@test.com',
+        'password': 'password123',
+        'first_name': 'No',
+        'last_name': 'License',
+        'role': 'doctor',
+        'specialization': 'Cardiology'
+    })
+
+    assert response.status_code == 400
+    assert json.loads(response.data)['success'] is False
+    assert client.post('/api/auth/login', json={
+        'email': 'nolicense@test.com',
+        'password': 'password123'
+    }).status_code == 401
+
+@pytest.mark.skipif(bool(os.environ.get('REDIS_URL')), reason='uses the shared Redis cache')
+def test_production_does_not_cache_users_per_process():
+    from app.extensions import cache
+    from app.utils.auth import user_cache_key
+
+    app = create_app('production')
+    with app.app_context():
+        # A per-process cache would keep serving a stale user record on other workers
+        cache.set(user_cache_key(1), {'id': 1, 'is_active': True})
+        assert cache.get(user_cache_key(1)) is None
+
+def test_register_doctor_with_null_fee(client):
+    response = client.post('/api/auth/register', json={
+        'email': 'nofee@test.com',
+        'password': 'password123',
+        'first_name': 'No',
+        'last_name': 'Fee',
+        'role': 'doctor',
+        'license_number': 'LIC-FEE',
+        'specialization': 'Cardiology',
+        'consultation_fee': None
+    })
+
+    assert response.status_code == 201
@@ -0,0 +1,184 @@
+import pytest
+import json
+from datetime import datetime, timezone
+from app import create_app
+from app.extensions import db
+from app.models import Appointment, TestReport, VitalSigns, Notification
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            yield client
+            db.drop_all()
+
+def register(client, email, role, **extra):
+    response = client.post('/api/auth/register', json={
+        'email': email,
+        'password': 'password123',
+        'first_name': 'Test',
+        'last_name': role.title(),
+        'role': role,
+        **extra
+    })
+    data = json.loads(response.data)
+    return data['token'], data['user']['id']
+
+def auth_header(token):
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def records(client):
+    doctor_token, _ = register(client, 'doctor@test.com', 'doctor',
+                               license_number='LIC-1', specialization='Cardiology')
+    other_token, _ = register(client, 'other@test.com', 'doctor',
+                              license_number='LIC-2', specialization='Neurology')
+    patient_token, _ = register(client, 'patient@test.com', 'patient')
+
+    profile = json.loads(client.get('/api/auth/profile', headers=auth_header(doctor_token)).data)
+    other = json.loads(client.get('/api/auth/profile', headers=auth_header(other_token)).data)
+    patient = json.loads(client.get('/api/auth/profile', headers=auth_header(patient_token)).data)
+    patient_id = patient['patient_info']['id']
+
+    appointments = [
+        Appointment(patient_id=patient_id, doctor_id=doctor['doctor_info']['id'],
+                    appointment_date=datetime(2030, 1, 1, 10))
+        for doctor in (profile, other)
+    ]
+    db.session.add_all(appointments)
+    db.session.flush()
+    db.session.add_all([
+        TestReport(appointment_id=appointment.id, patient_id=patient_id,
+                   test_name=f'Test {appointment.id}', test_type='blood',
+                   status='completed', completed_date=datetime(2030, 1, 2))
+        for appointment in appointments
+    ])
+    db.session.add(VitalSigns(patient_id=patient_id, recorded_by=profile['id'], heart_rate=70, notes='Resting'))
+    db.session.commit()
+
+    return {
+        'doctor_token': doctor_token,
+        'patient_token': patient_token,
+        'patient_id': patient_id,
+        'appointment_id': appointments[0].id
+    }
+
+def test_doctor_sees_only_own_test_reports(client, records):
+    response = client.get('/api/medical/test-reports', headers=auth_header(records['doctor_token']))
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [r['appointment_id'] for r in data['test_reports']] == [records['appointment_id']]
+
+def test_patient_sees_all_own_test_reports(client, records):
+    response = client.get('/api/medical/test-reports', headers=auth_header(records['patient_token']))
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data['test_reports']) == 2
+    assert 'comments' not in data['test_reports'][0]
+    assert 'normal_range' in data['test_reports'][0]
+
+def test_get_vital_signs(client, records):
+    response = client.get(f"/api/medical/vital-signs?patient_id={records['patient_id']}",
+                          headers=auth_header(records['doctor_token']))
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['vital_signs'][0]['heart_rate'] == 70
+    assert data['vital_signs'][0]['notes'] == 'Resting'
+
+def test_upload_test_report_notifies_patient_and_doctor(client, records):
+    response = client.post('/api/medical/test-reports', headers=auth_header(records['doctor_token']), json={
+        'appointment_id': records['appointment_id'],
+        'patient_id': records['patient_id'],
+        'test_name': 'CBC',
+        'test_type': 'blood',
+        'result': 'normal'
+    })
+
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    assert data['test_report']['test_name'] == 'CBC'
+    notifications = Notification.query.filter_by(notification_type='test_report').all()
+    assert len(notifications) == 2
+    assert {n.message for n in notifications} == {
+        'Your CBC test results are available',
+        'Test results for Test are available'
+    }
+
+def test_add_medical_record_dates(client, records):
+    headers = auth_header(records['doctor_token'])
+    dated = client.post('/api/medical/medical-records', headers=headers, json={
+        'patient_id': records['patient_id'],
+        'record_type': 'allergy',
+        'description': 'Penicillin',
+        'date_recorded': '2020-05-17'
+    })
+    undated = client.post('/api/medical/medical-records', headers=headers, json={
+        'patient_id': records['patient_id'],
+        'record_type': 'condition',
+        'description': 'Asthma'
+    })
+
+    assert dated.status_code == 201
+    assert json.loads(dated.data)['medical_record']['date_recorded'] == '2020-05-17'
+    assert undated.status_code == 201
+    assert json.loads(undated.data)['medical_record']['date_recorded'] == datetime.now(timezone.utc).date().isoformat()
+
+def test_add_medical_record_invalid_date(client, records):
+    response = client.post('/api/medical/medical-records', headers=auth_header(records['doctor_token']), json={
+        'patient_id': records['patient_id'],
+        'record_type': 'allergy',
+        'description': 'Penicillin',
+        'date_recorded': 'garbage'
+    })
+
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'].startswith('Invalid date format')
+
+def test_patient_arrival_notifies_doctor(client, records):
+    nurse_token, _ = register(client, 'nurse@test.com', 'nurse')
+    response = client.put(f"/api/medical/patient-arrival/{records['appointment_id']}",
+                          headers=auth_header(nurse_token), json={'arrival_status': 'arrived'})
+
+    assert response.status_code == 200
+    assert db.session.get(Appointment, records['appointment_id']).arrival_status == 'arrived'
+    notification = Notification.query.filter_by(notification_type='patient_arrival').one()
+    assert notification.message == 'Patient Test has arrived'
+
+def test_patient_arrival_requires_status(client, records):
+    nurse_token, _ = register(client, 'nurse@test.com', 'nurse')
+    response = client.put(f"/api/medical/patient-arrival/{records['appointment_id']}",
+                          headers=auth_header(nurse_token), json={})
+
+    assert response.status_code == 400
+    assert '`arrival_status`' in json.loads(response.data)['message']
+
+def test_get_test_reports_database_error(client, records):
+    TestReport.__table__.drop(db.engine)
+    response = client.get('/api/medical/test-reports', headers=auth_header(records['patient_token']))
+
+    assert response.status_code == 500
+    assert json.loads(response.data) == {'message': 'Database error', 'success': False}
+
+def test_record_vital_signs_lenient_numbers(client, records):
+    headers = auth_header(records['doctor_token'])
+    response = client.post('/api/medical/vital-signs', headers=headers, json={
+        'patient_id': records['patient_id'],
+        'heart_rate': 72.0,
+        'notes': 42
+    })
+    fractional = client.post('/api/medical/vital-signs', headers=headers, json={
+        'patient_id': records['patient_id'],
+        'heart_rate': 72.5
+    })
+
+    assert response.status_code == 201
+    data = json.loads(response.data)['vital_signs']
+    assert data['heart_rate'] == 72
+    assert data['notes'] == '42'
+    assert fractional.status_code == 400
+    assert '`$.heart_rate`' in json.loads(fractional.data)['message']